@@ -1,14 +1,19 @@
 import logging
 import os
+import random
 import sys
 import time
+from functools import lru_cache
 from http import HTTPStatus
 from logging import StreamHandler
+from urllib.parse import urlsplit
 
+import orjson
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
-from telegram import Bot
+from urllib3.util.retry import Retry
 
 from exceptions import ServerError, WrongAPIAnswerError
 
@@ -18,38 +23,97 @@ FORMAT = (
     '%(asctime)s - %(name)s - %(levelname)s - '
     '[%(filename)s:%(lineno)d] - %(funcName)s - %(message)s'
 )
+FORMATTER = logging.Formatter(FORMAT)
 logger = logging.getLogger(__name__)
 
 console = StreamHandler(sys.stdout)
-console.setFormatter(logging.Formatter(FORMAT))
+console.setFormatter(FORMATTER)
 logger.addHandler(console)
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-TOKENS_NAME = ['PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID']
-MISTAKE_KEYS = ['error', 'code']
+MISTAKE_KEYS = frozenset(('error', 'code'))
+
+TELEGRAM_API = 'https://api.telegram.org/'
+TELEGRAM_ENDPOINT = TELEGRAM_API + 'bot{token}/sendMessage'
+TELEGRAM_MESSAGE_LIMIT = 4096
 
 RETRY_TIME = 600
+RETRY_BASE_TIME = 5
+API_TIMEOUT = (5, 30)
+TELEGRAM_TIMEOUT = 10
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[
+            HTTPStatus.BAD_GATEWAY,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            HTTPStatus.GATEWAY_TIMEOUT,
+        ],
+        allowed_methods=['GET'],
+        respect_retry_after_header=False,
+    ),
+))
+SESSION.mount(TELEGRAM_API, HTTPAdapter(
+    pool_connections=1, pool_maxsize=4, max_retries=0
+))
+
 VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
-
-
-def send_message(bot, message):
+STATUS_MESSAGE = 'Изменился статус проверки работы "{name}". {verdict}'
+
+
+def split_message(message):
+    """Делит сообщение на части по строкам в пределах лимита Telegram."""
+    chunks = []
+    chunk = ''
+    for line in message.split('\n'):
+        if chunk and len(chunk) + len(line) + 1 > TELEGRAM_MESSAGE_LIMIT:
+            chunks.append(chunk)
+            chunk = ''
+        chunk = f'{chunk}\n{line}' if chunk else line
+        while len(chunk) > TELEGRAM_MESSAGE_LIMIT:
+            chunks.append(chunk[:TELEGRAM_MESSAGE_LIMIT])
+            chunk = chunk[TELEGRAM_MESSAGE_LIMIT:]
+    chunks.append(chunk)
+    return chunks
+
+
+def send_message(session, message):
     """Отправляет сообщения в Telegram."""
+    url = TELEGRAM_ENDPOINT.format(token=TELEGRAM_TOKEN)
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
-        logger.info(f'Отправлено сообщение: "{message}"')
+        for chunk in split_message(message):
+            response = session.post(
+                url,
+                data={'chat_id': TELEGRAM_CHAT_ID, 'text': chunk},
+                timeout=TELEGRAM_TIMEOUT,
+            )
+            if response.status_code != HTTPStatus.OK:
+                raise ServerError(
+                    f'Ошибочный код возврата Telegram - '
+                    f'{response.status_code}: {response.text}.'
+                )
+        logger.info('Отправлено сообщение: "%s"', message)
+    except ServerError as error:
+        logger.error('%s! Ошибка отправки сообщения "%s".', error, message)
+        return False
     except Exception as error:
         logger.error(
-            f'{error}! Ошибка отправки сообщения "{message}".',
-            exc_info=True
+            '%s при обращении к %s! Ошибка отправки сообщения "%s".',
+            type(error).__name__, urlsplit(url).hostname, message
         )
         return False
     return True
@@ -59,7 +123,9 @@ def get_api_answer(timestamp):
     """Делает запрос к API, возвращает ответ в формате JSON."""
     params = {'from_date': timestamp}
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+        response = SESSION.get(
+            ENDPOINT, headers=HEADERS, params=params, timeout=API_TIMEOUT
+        )
     except RequestException as error:
         raise ConnectionError(
             f'Ошибка соединения - {error}. '
@@ -70,45 +136,48 @@ def get_api_answer(timestamp):
             f'Ошибочный код возврата - {response.status_code}. '
             f'Параметры запроса {ENDPOINT}, {HEADERS}, {params}.'
         )
-    answer = response.json()
-    mistakes = [mistake for mistake in MISTAKE_KEYS if mistake in answer]
-    if mistakes:
-        raise WrongAPIAnswerError(
-            f'Ошибка на сервере: {mistakes}. '
-            f'Параметры запроса: {ENDPOINT}, {HEADERS}, {params}.'
-        )
-    return answer
+    return orjson.loads(response.content)
 
 
 def check_response(response):
     """Проверяет ответ API на корректность, возвращает список работ."""
-    if len(response) == 0:
-        raise WrongAPIAnswerError('Пустой ответ API.')
     if not isinstance(response, dict):
         raise TypeError(f'Некорректный тип ответа API: "{type(response)}".')
-    if 'homeworks' not in response:
-        raise WrongAPIAnswerError('В ответе API отсутствует ключ "homeworks".')
+    mistakes = MISTAKE_KEYS.intersection(response)
+    if mistakes:
+        raise WrongAPIAnswerError(f'Ошибка на сервере: {sorted(mistakes)}.')
     homeworks = response.get('homeworks')
+    if homeworks is None:
+        raise WrongAPIAnswerError('В ответе API отсутствует ключ "homeworks".')
     if not isinstance(homeworks, list):
         raise TypeError('Объект "homeworks" не является списком')
     return homeworks
 
 
-def parse_status(homework):
-    """Извлекает статус конкретной домашней работы."""
-    name = homework['homework_name']
-    status = homework['status']
+@lru_cache(maxsize=256)
+def format_status(name, status):
+    """Формирует сообщение о статусе работы, кэшируя результат."""
     verdict = VERDICTS.get(status)
-    if status not in VERDICTS:
+    if verdict is None:
         raise ValueError(f'Неожиданный статус "{status}" домашней работы!')
-    return f'Изменился статус проверки работы "{name}". {verdict}'
+    return STATUS_MESSAGE.format(name=name, verdict=verdict)
+
+
+def parse_status(homework):
+    """Извлекает статус конкретной домашней работы."""
+    return format_status(homework['homework_name'], homework['status'])
 
 
 def check_tokens():
     """Проверяет доступность переменных окружения."""
-    missing_tokens = [name for name in TOKENS_NAME if globals()[name] is None]
+    tokens = (
+        ('PRACTICUM_TOKEN', PRACTICUM_TOKEN),
+        ('TELEGRAM_TOKEN', TELEGRAM_TOKEN),
+        ('TELEGRAM_CHAT_ID', TELEGRAM_CHAT_ID),
+    )
+    missing_tokens = [name for name, value in tokens if not value]
     if missing_tokens:
-        logger.critical(f'Отсутствуют необходимые токены "{missing_tokens}".')
+        logger.critical('Отсутствуют необходимые токены "%s".', missing_tokens)
         return False
     return True
 
@@ -119,9 +188,10 @@ def main():
         raise ValueError('Отсутствуют аутентификационные данные.')
     logger.info('Аутентификационные данные получены.')
 
-    bot = Bot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
     previous_message = ''
+    backoff = RETRY_BASE_TIME
+    next_tick = time.monotonic()
     while True:
         try:
             message = ''
@@ -132,25 +202,33 @@ def main():
             previous_message = ''
             timestamp = response.get('current_date', timestamp)
             if homeworks:
-                message = parse_status(homeworks[0])
+                message = '\n'.join(
+                    parse_status(homework) for homework in homeworks
+                )
             else:
                 logger.info('Нет обновленных статусов домашних работ.')
+            backoff = RETRY_BASE_TIME
+            next_tick += RETRY_TIME
 
         except Exception as error:
             message = f'Сбой в работе программы: {error}'
+            backoff = min(
+                RETRY_TIME, random.uniform(RETRY_BASE_TIME, backoff * 3)
+            )
+            next_tick = time.monotonic() + backoff
 
         finally:
             if (message and message != previous_message and send_message(
-                    bot, message)):
+                    SESSION, message)):
                 previous_message = message
-            time.sleep(RETRY_TIME)
+            time.sleep(max(0, next_tick - time.monotonic()))
 
 
 if __name__ == '__main__':
-    logging.basicConfig(
-        level=logging.INFO,
-        filename=__file__ + '.log',
-        format=FORMAT,
-        filemode='w',
-    )
+    file_handler = logging.FileHandler(__file__ + '.log', mode='w')
+    file_handler.setFormatter(FORMATTER)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(file_handler)
+    root_logger.setLevel(logging.INFO)
+    logging.getLogger('urllib3').setLevel(logging.WARNING)
     main()
@@ -1,15 +1,18 @@
+import json
+import logging
 import os
 from http import HTTPStatus
+from types import SimpleNamespace
 
 import requests
-import telegram
 import utils
 
 
 class MockResponseGET:
 
-    def __init__(self, url, params=None, random_timestamp=None,
+    def __init__(self, session, url, params=None, random_timestamp=None,
                  current_timestamp=None, http_status=HTTPStatus.OK, **kwargs):
+        kwargs['headers'] = {**session.headers, **kwargs.get('headers', {})}
         assert (
             url.startswith(
                 'https://practicum.yandex.ru/api/user_api/homework_statuses'
@@ -42,9 +45,17 @@ class MockResponseGET:
             'Проверьте, что в параметрах `params` для запроса статуса '
             'домашней работы `from_date` передаете timestamp'
         )
+        assert kwargs.get('timeout') is not None, (
+            'Проверьте, что вы передали `timeout` для запроса '
+            'статуса домашней работы'
+        )
         self.random_timestamp = random_timestamp
         self.status_code = http_status
 
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode()
+
     def json(self):
         data = {
             "homeworks": [],
@@ -53,24 +64,38 @@ class MockResponseGET:
         return data
 
 
-class MockTelegramBot:
+class MockResponsePOST:
 
-    def __init__(self, token=None, random_timestamp=None, **kwargs):
-        assert token is not None, (
-            'Проверьте, что вы передали токен бота Telegram'
+    def __init__(self, session, url, data=None, http_status=HTTPStatus.OK,
+                 **kwargs):
+        assert url.startswith('https://api.telegram.org/bot'), (
+            'Проверьте, что вы отправляете сообщение через API Telegram'
         )
-        self.random_timestamp = random_timestamp
-
-    def send_message(self, chat_id=None, text=None, **kwargs):
-        assert chat_id is not None, (
-            'Проверьте, что вы передали chat_id= при отправке '
-            'сообщения ботом Telegram'
+        headers = {**session.headers, **(kwargs.get('headers') or {})}
+        assert 'Authorization' not in headers, (
+            'Проверьте, что заголовок Authorization для API Практикума '
+            'не передаётся в Telegram'
+        )
+        assert data is not None, (
+            'Проверьте, что вы передали данные `data` при отправке '
+            'сообщения в Telegram'
+        )
+        assert data.get('chat_id') is not None, (
+            'Проверьте, что вы передали chat_id при отправке '
+            'сообщения в Telegram'
         )
-        assert text is not None, (
-            'Проверьте, что вы передали text= при отправке '
-            'сообщения ботом Telegram'
+        assert data.get('text') is not None, (
+            'Проверьте, что вы передали text при отправке '
+            'сообщения в Telegram'
         )
-        return self.random_timestamp
+        assert kwargs.get('timeout') is not None, (
+            'Проверьте, что вы передали `timeout` при отправке '
+            'сообщения в Telegram'
+        )
+        self.status_code = http_status
+        self.text = '{"ok": true}'
+        if http_status != HTTPStatus.OK:
+            self.text = '{"ok": false, "description": "Bad Request"}'
 
 
 class TestHomework:
@@ -153,31 +178,106 @@ class TestHomework:
     def test_bot_init_not_global(self):
         import homework
 
-        assert not (hasattr(homework, 'bot') and isinstance(getattr(homework, 'bot'), telegram.Bot)), (
-            'Убедитесь, что бот инициализирован только в main()'
+        assert not hasattr(homework, 'bot'), (
+            'Убедитесь, что бот не создаётся как глобальная переменная'
         )
 
-    def test_logger(self, monkeypatch, random_timestamp):
-        def mock_telegram_bot(*args, **kwargs):
-            return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
-
-        monkeypatch.setattr(telegram, "Bot", mock_telegram_bot)
-
+    def test_logger(self):
         import homework
 
         assert hasattr(homework, 'logging'), (
             'Убедитесь, что настроили логирование для вашего бота'
         )
 
-    def test_send_message(self, monkeypatch, random_timestamp):
-        def mock_telegram_bot(*args, **kwargs):
-            return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
+    def test_send_message(self, monkeypatch):
+        def mock_response_post(*args, **kwargs):
+            return MockResponsePOST(*args, **kwargs)
 
-        monkeypatch.setattr(telegram, "Bot", mock_telegram_bot)
+        monkeypatch.setattr(requests.Session, 'post', mock_response_post)
 
         import homework
         utils.check_function(homework, 'send_message', 2)
 
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        assert homework.send_message(homework.SESSION, 'message'), (
+            'Проверьте, что функция `send_message` возвращает True '
+            'при успешной отправке сообщения'
+        )
+
+    def test_send_message_not_ok(self, monkeypatch):
+        def mock_400_response_post(*args, **kwargs):
+            return MockResponsePOST(
+                *args, http_status=HTTPStatus.BAD_REQUEST, **kwargs
+            )
+
+        monkeypatch.setattr(requests.Session, 'post', mock_400_response_post)
+
+        import homework
+
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        assert not homework.send_message(homework.SESSION, 'message'), (
+            'Проверьте, что функция `send_message` возвращает False, '
+            'когда Telegram отвечает кодом, отличным от 200'
+        )
+
+    def test_send_message_does_not_log_token(self, monkeypatch, caplog):
+        import homework
+
+        token = '1234:secrettoken'
+        url = 'https://127.0.0.1:1/'
+        telegram_adapter = homework.SESSION.get_adapter(homework.TELEGRAM_API)
+        monkeypatch.setattr(
+            homework.SESSION, 'adapters', homework.SESSION.adapters.copy()
+        )
+        homework.SESSION.mount(url, telegram_adapter)
+        monkeypatch.setattr(homework, 'TELEGRAM_ENDPOINT', url + 'bot{token}')
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', token)
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+        caplog.set_level(logging.DEBUG)
+
+        assert not homework.send_message(homework.SESSION, 'message'), (
+            'Проверьте, что функция `send_message` возвращает False '
+            'при ошибке соединения с Telegram'
+        )
+        assert token not in caplog.text, (
+            'Убедитесь, что токен Telegram не попадает в логи '
+            'при ошибке отправки сообщения'
+        )
+
+    def test_split_message(self):
+        import homework
+
+        func_name = 'split_message'
+        utils.check_function(homework, func_name, 1)
+
+        limit = homework.TELEGRAM_MESSAGE_LIMIT
+        line = 'x' * (limit // 3)
+        message = '\n'.join([line] * 5)
+        chunks = homework.split_message(message)
+        assert all(len(chunk) <= limit for chunk in chunks), (
+            f'Проверьте, что функция `{func_name}` возвращает части '
+            'не длиннее лимита Telegram'
+        )
+        assert '\n'.join(chunks) == message, (
+            f'Проверьте, что функция `{func_name}` не теряет строки сообщения'
+        )
+        assert homework.split_message('short') == ['short'], (
+            f'Проверьте, что функция `{func_name}` не делит короткие сообщения'
+        )
+
+        long_line = 'y' * (limit * 2 + 1)
+        chunks = homework.split_message(long_line)
+        assert all(len(chunk) <= limit for chunk in chunks), (
+            f'Проверьте, что функция `{func_name}` делит строки '
+            'длиннее лимита Telegram'
+        )
+        assert ''.join(chunks) == long_line, (
+            f'Проверьте, что функция `{func_name}` не теряет символы '
+            'при делении длинной строки'
+        )
+
     def test_get_api_answers(self, monkeypatch, random_timestamp,
                              current_timestamp, api_url):
         def mock_response_get(*args, **kwargs):
@@ -186,7 +286,7 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -232,7 +332,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_500_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_500_response_get)
 
         import homework
 
@@ -315,7 +415,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -352,7 +452,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -400,7 +500,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -448,7 +548,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -484,7 +584,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_no_homeworks_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_no_homeworks_response_get)
 
         import homework
 
@@ -525,7 +625,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -565,7 +665,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -599,7 +699,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_empty_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_empty_response_get)
 
         import homework
 
@@ -626,7 +726,7 @@ class TestHomework:
             )
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -640,3 +740,67 @@ class TestHomework:
                 f'Убедитесь, что в функции `{func_name}` обрабатываете ситуацию, '
                 'когда API возвращает код, отличный от 200'
             )
+
+    def test_main_schedule(self, monkeypatch):
+        import homework
+
+        class StopLoop(Exception):
+            pass
+
+        clock = [1000.0]
+        sleeps = []
+        uniform_calls = []
+        # (длительность запроса, успешен ли запрос)
+        polls = iter([(10, True), (20, False), (0, True)])
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+            if len(sleeps) == 3:
+                raise StopLoop
+
+        def fake_get_api_answer(timestamp):
+            duration, ok = next(polls)
+            clock[0] += duration
+            if not ok:
+                raise ConnectionError('Сервер недоступен')
+            return {'homeworks': [], 'current_date': int(clock[0])}
+
+        def fake_uniform(low, high):
+            uniform_calls.append((low, high))
+            return 7
+
+        monkeypatch.setattr(homework, 'time', SimpleNamespace(
+            time=lambda: clock[0],
+            monotonic=lambda: clock[0],
+            sleep=fake_sleep,
+        ))
+        monkeypatch.setattr(
+            homework, 'random', SimpleNamespace(uniform=fake_uniform)
+        )
+        monkeypatch.setattr(homework, 'check_tokens', lambda: True)
+        monkeypatch.setattr(homework, 'get_api_answer', fake_get_api_answer)
+        monkeypatch.setattr(homework, 'send_message', lambda *args: True)
+
+        try:
+            homework.main()
+        except StopLoop:
+            pass
+
+        retry_time = homework.RETRY_TIME
+        base_time = homework.RETRY_BASE_TIME
+        assert sleeps[0] == retry_time - 10, (
+            'Проверьте, что после успешного запроса бот ждёт до следующего '
+            'опроса по сетке `RETRY_TIME`, учитывая длительность запроса'
+        )
+        assert uniform_calls == [(base_time, base_time * 3)], (
+            'Проверьте, что после первой ошибки пауза выбирается '
+            'между `RETRY_BASE_TIME` и `RETRY_BASE_TIME * 3`'
+        )
+        assert sleeps[1] == 7, (
+            'Проверьте, что после ошибки пауза отсчитывается от момента '
+            'ошибки, а не от начала итерации'
+        )
+        assert sleeps[2] == retry_time, (
+            'Проверьте, что после восстановления бот снова ждёт `RETRY_TIME`'
+        )